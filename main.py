@@ -9,7 +9,8 @@ import textwrap
 from PIL import Image, ImageTk
 from tkinter import (
     Tk, Text, Button, filedialog, messagebox,
-    Canvas, Checkbutton, IntVar, Toplevel, W, END, BOTH, N, DISABLED, NORMAL, X
+    Canvas, Checkbutton, IntVar, Toplevel, W, END, BOTH, N, DISABLED, NORMAL, X,
+    Scrollbar, LEFT, RIGHT, Y, SCROLL, UNITS
 )
 from tkinter.ttk import Frame, Style
 
@@ -351,8 +352,15 @@ class MolingViewer(Frame):
         window = Toplevel(self)
         window.title(postcondition.name)
         data = self._read_table(postcondition.path)
-        table = Table(window, list(data.keys()), column_minwidths=[None for _ in data.keys()])
-        table.pack(expand=True, fill=X, padx=10, pady=10)
+        scrollbar = Scrollbar(window)
+        scrollbar.pack(side=RIGHT, fill=Y, pady=10)
+        table = Table(window, list(data.keys()), column_minwidths=[None for _ in data.keys()],
+                      visible_rows=30, yscrollcommand=scrollbar.set)
+        table.pack(side=LEFT, expand=True, fill=X, padx=10, pady=10)
+        scrollbar.configure(command=table.yview)
+        window.bind('<MouseWheel>', lambda event: table.yview(SCROLL, -1 if event.delta > 0 else 1, UNITS))
+        window.bind('<Button-4>', lambda event: table.yview(SCROLL, -1, UNITS))
+        window.bind('<Button-5>', lambda event: table.yview(SCROLL, 1, UNITS))
         table.set_data(list(zip(*[data[header] for header in data.keys()])))
 
 
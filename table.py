@@ -1,6 +1,8 @@
 # Author: Miguel Martinez Lopez
 # Version: 0.14
 
+from bisect import bisect_left, insort
+
 try:
     from Tkinter import Frame, Label, Message, StringVar
     from Tkconstants import *
@@ -42,12 +44,80 @@ class Header_Cell(Cell):
             separator.pack(fill=X, anchor=anchor)
 
 
+class Column_Index(object):
+    """Row ids of the store kept sorted by the key of one column.
+
+    Entries are (key, row id) pairs, so rows with equal keys are ordered by creation: a row
+    created later comes later, whatever position insert_row gave it.
+    Values the key function rejects with ValueError or TypeError, like blank cells with key=float,
+    sort after all the others.
+    """
+
+    def __init__(self, rows, column, key=None):
+        self.column = column
+        self.key = key
+
+        self.key_by_id = {}
+        for row_id, row in rows.items():
+            self.key_by_id[row_id] = self.key_of(row[column])
+
+        self.entries = sorted((k, row_id) for row_id, k in self.key_by_id.items())
+
+    def key_of(self, value):
+        if self.key is None:
+            return (0, value)
+
+        try:
+            return (0, self.key(value))
+        except (ValueError, TypeError):
+            return (1,)
+
+    def add(self, row_id, k):
+        self.key_by_id[row_id] = k
+        insort(self.entries, (k, row_id))
+
+    def discard(self, row_id):
+        k = self.key_by_id.pop(row_id)
+        del self.entries[bisect_left(self.entries, (k, row_id))]
+
+    def precedes(self, row_id_1, row_id_2, reverse=False):
+        """Whether the first row comes before the second one in the sorted order"""
+        key_1 = self.key_by_id[row_id_1]
+        key_2 = self.key_by_id[row_id_2]
+
+        if reverse and key_1[0] == key_2[0] and key_1 != key_2:
+            return key_1 > key_2
+        return (key_1, row_id_1) < (key_2, row_id_2)
+
+    def sorted_row_ids(self, reverse=False):
+        entries = self.entries
+        if not reverse:
+            return [row_id for _, row_id in entries]
+
+        # Only the keys are reversed: equal keys stay in creation order
+        # and rejected values stay last.
+        rejected = bisect_left(entries, ((1,),))
+        accepted = sorted(entries[:rejected], key=lambda entry: entry[0], reverse=True)
+        return [row_id for _, row_id in accepted] + [row_id for _, row_id in entries[rejected:]]
+
+
 class Table(Frame):
+    """Grid of cells backed by a row store.
+
+    The store holds every row. Sorting and filtering only change which stored
+    rows are shown and in which order; row indices passed to the public
+    methods always refer to the rows currently shown.
+
+    With visible_rows set, only that many grid rows are created and they show
+    a window over the shown rows. The window is moved with yview, which a
+    Scrollbar can drive, and reported through yscrollcommand.
+    """
+
     def __init__(self, master, columns, column_weights=None, column_minwidths=None, height=None, minwidth=20,
                  minheight=20, padx=5, pady=5, cell_font=None, cell_foreground="black", cell_background="white",
                  cell_anchor=W, header_font=None, header_background="white", header_foreground="black",
                  header_anchor=CENTER, bordercolor="#999999", innerborder=True, outerborder=True,
-                 stripped_rows=("#EEEEEE", "white"), on_change_data=None):
+                 stripped_rows=("#EEEEEE", "white"), on_change_data=None, visible_rows=None, yscrollcommand=None):
         outerborder_width = 1 if outerborder else 0
 
         Frame.__init__(self, master, highlightbackground=bordercolor, highlightcolor=bordercolor,
@@ -71,6 +141,27 @@ class Table(Frame):
 
         self._data_vars = []
 
+        # Row store: row id -> list of values, plus the ids in insertion order
+        self._rows = {}
+        self._order = []
+        self._next_row_id = 0
+
+        # Column -> Column_Index, built on first sort by that column
+        self._column_indexes = {}
+
+        self._sort_column = None
+        self._sort_reverse = False
+        self._filter_predicate = None
+
+        # Ids of the rows shown, and the id each grid row currently displays
+        self._view = []
+        self._displayed_ids = []
+
+        # Position in the view of the first grid row
+        self._visible_rows = visible_rows
+        self._first_row = 0
+        self._yscrollcommand = yscrollcommand
+
         self._columns = columns
 
         for j in range(len(columns)):
@@ -97,7 +188,9 @@ class Table(Frame):
                 self.grid_columnconfigure(j, minsize=minwidth)
 
         if height is not None:
-            self._append_n_rows(height)
+            for _ in range(height):
+                self._store_row([""] * self._number_of_columns)
+            self._update_view()
 
         self._on_change_data = on_change_data
 
@@ -124,6 +217,7 @@ class Table(Frame):
                 cell.grid(row=i, column=j, sticky=N + E + W + S)
 
             self._data_vars.append(list_of_vars)
+            self._displayed_ids.append(None)
 
         self._number_of_rows += n
 
@@ -135,145 +229,375 @@ class Table(Frame):
                 self.grid_slaves(row=i, column=j)[0].destroy()
 
             self._data_vars.pop()
+            self._displayed_ids.pop()
 
         self._number_of_rows -= n
 
+    def _check_row(self, data):
+        if len(data) != self._number_of_columns:
+            raise ValueError("data has no %d elements: %s" % (self._number_of_columns, data))
+
+    def _column_position(self, column):
+        number_of_columns = self._number_of_columns
+        if not -number_of_columns <= column < number_of_columns:
+            raise IndexError("column index out of range: %s" % column)
+        return column % number_of_columns
+
+    def _shown_position(self, index):
+        number_of_rows = len(self._view)
+        if not -number_of_rows <= index < number_of_rows:
+            raise IndexError("row index out of range: %s" % index)
+        return index % number_of_rows
+
+    def _store_row(self, data, position=None):
+        row = list(data)
+
+        # Keys are computed before anything changes, so a failing key leaves the store untouched
+        keys = [(column_index, column_index.key_of(row[column_index.column]))
+                for column_index in self._column_indexes.values()]
+
+        row_id = self._next_row_id
+        self._next_row_id += 1
+
+        self._rows[row_id] = row
+
+        if position is None:
+            self._order.append(row_id)
+        else:
+            self._order.insert(position, row_id)
+
+        for column_index, k in keys:
+            column_index.add(row_id, k)
+
+        return row_id
+
+    def _unstore_row(self, row_id):
+        del self._rows[row_id]
+        self._order.remove(row_id)
+
+        for column_index in self._column_indexes.values():
+            column_index.discard(row_id)
+
+    def _set_stored_cells(self, row_id, values):
+        """Set the values of a stored row, given as a column -> value mapping"""
+        keys = []
+        for column, value in values.items():
+            column_index = self._column_indexes.get(column)
+            if column_index is not None:
+                keys.append((column_index, column_index.key_of(value)))
+
+        for column_index, k in keys:
+            column_index.discard(row_id)
+            column_index.add(row_id, k)
+
+        row = self._rows[row_id]
+        for column, value in values.items():
+            row[column] = value
+
+    def _is_shown(self, row_id):
+        predicate = self._filter_predicate
+        return predicate is None or predicate(self._rows[row_id])
+
+    def _sorted_position(self, row_id):
+        """Position in the sorted view for a row that is not in the view"""
+        column_index = self._column_indexes[self._sort_column]
+        view = self._view
+
+        low = 0
+        high = len(view)
+        while low < high:
+            middle = (low + high) // 2
+            if column_index.precedes(view[middle], row_id, self._sort_reverse):
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _update_view(self, changed_ids=()):
+        """Recompute the shown rows and refresh the grid cells that changed"""
+        if self._sort_column is None:
+            row_ids = self._order
+        else:
+            row_ids = self._column_indexes[self._sort_column].sorted_row_ids(self._sort_reverse)
+
+        predicate = self._filter_predicate
+        if predicate is None:
+            self._view = list(row_ids)
+        else:
+            rows = self._rows
+            self._view = [row_id for row_id in row_ids if predicate(rows[row_id])]
+
+        self._refresh_cells(changed_ids=changed_ids)
+
+    def _update_shown_row(self, position, resort):
+        """Move, keep or hide the shown row at position after its values changed"""
+        view = self._view
+        row_id = view[position]
+
+        if not self._is_shown(row_id):
+            del view[position]
+            self._refresh_cells(position)
+        elif resort:
+            del view[position]
+            new_position = self._sorted_position(row_id)
+            view.insert(new_position, row_id)
+            self._refresh_cells(min(position, new_position), max(position, new_position) + 1, (row_id,))
+        else:
+            self._refresh_cells(position, position + 1, (row_id,))
+
+    def _refresh_cells(self, start=0, stop=None, changed_ids=()):
+        """Refresh the grid rows showing view positions start to stop"""
+        view = self._view
+
+        if self._visible_rows is None:
+            number_of_rows = len(view)
+        else:
+            number_of_rows = min(len(view), self._visible_rows)
+
+        first_row = max(0, min(self._first_row, len(view) - number_of_rows))
+        if first_row != self._first_row:
+            # The window moved, so every grid row shows another row
+            self._first_row = first_row
+            start = 0
+            stop = None
+
+        if self._number_of_rows > number_of_rows:
+            self._pop_n_rows(self._number_of_rows - number_of_rows)
+        elif self._number_of_rows < number_of_rows:
+            self._append_n_rows(number_of_rows - self._number_of_rows)
+
+        last_row = first_row + number_of_rows
+        if stop is None or stop > last_row:
+            stop = last_row
+
+        displayed_ids = self._displayed_ids
+        rows = self._rows
+        for position in range(max(start, first_row), stop):
+            i = position - first_row
+            row_id = view[position]
+            if displayed_ids[i] == row_id and row_id not in changed_ids:
+                continue
+
+            for var, value in zip(self._data_vars[i], rows[row_id]):
+                var.set(value)
+            displayed_ids[i] = row_id
+
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self.yview())
+
+    def sort(self, column=None, reverse=False, key=None):
+        """Show the rows ordered by a column. Pass no column to restore insertion order.
+
+        "key" is applied to the cell values before comparing them, e.g. key=float. Values it
+        rejects with ValueError or TypeError, like blank cells, go last in both directions.
+        Rows with equal keys are shown in creation order, also when reversed, not in the
+        position insert_row gave them: a row inserted at index 0 comes after its equal-key neighbours.
+        """
+        if column is not None:
+            column = self._column_position(column)
+            column_index = self._column_indexes.get(column)
+            if column_index is None or column_index.key is not key:
+                self._column_indexes[column] = Column_Index(self._rows, column, key)
+
+        self._sort_column = column
+        self._sort_reverse = reverse
+        self._update_view()
+
+    def filter(self, predicate=None):
+        """Show only the rows for which predicate(row) is true. Pass no predicate to show all rows."""
+        self._filter_predicate = predicate
+        self._update_view()
+
+    @property
+    def sort_column(self):
+        return self._sort_column
+
+    @property
+    def sort_reverse(self):
+        return self._sort_reverse
+
+    @property
+    def filter_predicate(self):
+        return self._filter_predicate
+
+    def yview(self, *args):
+        """Move the window of visible rows, following the Scrollbar protocol.
+
+        Without arguments return the fractions of the shown rows at the top and bottom of the window.
+        """
+        number_of_shown_rows = len(self._view)
+
+        if not args:
+            if number_of_shown_rows == 0:
+                return 0.0, 1.0
+            return (float(self._first_row) / number_of_shown_rows,
+                    float(self._first_row + self._number_of_rows) / number_of_shown_rows)
+
+        if args[0] == MOVETO:
+            self._first_row = int(float(args[1]) * number_of_shown_rows)
+        elif args[0] == SCROLL:
+            step = int(args[1])
+            if args[2] == PAGES:
+                step *= max(self._number_of_rows, 1)
+            self._first_row = max(0, self._first_row + step)
+
+        self._refresh_cells()
+
     def set_data(self, data):
-        n = len(data)
-        m = len(data[0])
+        for row in data:
+            self._check_row(row)
 
-        number_of_rows = self._number_of_rows
+        rows = {}
+        order = []
+        for row in data:
+            row_id = self._next_row_id
+            self._next_row_id += 1
+
+            rows[row_id] = list(row)
+            order.append(row_id)
 
-        if number_of_rows > n:
-            self._pop_n_rows(number_of_rows - n)
-        elif number_of_rows < n:
-            self._append_n_rows(n - number_of_rows)
+        column_indexes = {}
+        for column, column_index in self._column_indexes.items():
+            column_indexes[column] = Column_Index(rows, column, column_index.key)
 
-        for i in range(n):
-            for j in range(m):
-                self._data_vars[i][j].set(data[i][j])
+        self._rows = rows
+        self._order = order
+        self._column_indexes = column_indexes
+        self._first_row = 0
+
+        self._update_view()
 
         if self._on_change_data is not None: self._on_change_data()
 
     def get_data(self):
-        number_of_rows = self._number_of_rows
-        number_of_columns = self._number_of_columns
-
-        data = []
-        for i in range(number_of_rows):
-            row = []
-            row_of_vars = self._data_vars[i]
-            for j in range(number_of_columns):
-                cell_data = row_of_vars[j].get()
-                row.append(cell_data)
+        rows = self._rows
+        return [list(rows[row_id]) for row_id in self._view]
 
-            data.append(row)
-        return data
+    def get_all_data(self):
+        """Get every stored row in insertion order, ignoring sort and filter"""
+        rows = self._rows
+        return [list(rows[row_id]) for row_id in self._order]
 
     @property
     def number_of_rows(self):
-        return self._number_of_rows
+        return len(self._view)
+
+    @property
+    def number_of_stored_rows(self):
+        return len(self._order)
 
     @property
     def number_of_columns(self):
         return self._number_of_columns
 
     def row(self, index, data=None):
-        number_of_columns = self._number_of_columns
+        position = self._shown_position(index)
+        row_id = self._view[position]
 
         if data is None:
-            row = []
-            row_of_vars = self._data_vars[index]
-
-            for j in range(number_of_columns):
-                row.append(row_of_vars[j].get())
-
-            return row
+            return list(self._rows[row_id])
         else:
-            if len(data) != number_of_columns:
-                raise ValueError("data has no %d elements: %s" % (number_of_columns, data))
+            self._check_row(data)
 
-            row_of_vars = self._data_vars[index]
-            for j in range(number_of_columns):
-                row_of_vars[index][j].set(data[j])
+            self._set_stored_cells(row_id, dict(enumerate(data)))
+            self._update_shown_row(position, resort=self._sort_column is not None)
 
             if self._on_change_data is not None: self._on_change_data()
 
     def column(self, index, data=None):
-        number_of_rows = self._number_of_rows
+        index = self._column_position(index)
+        view = self._view
 
         if data is None:
-            column = []
-
-            for i in range(number_of_rows):
-                column.append(self._data_vars[i][index].get())
-
-            return column
+            rows = self._rows
+            return [rows[row_id][index] for row_id in view]
         else:
+            if len(data) != len(view):
+                raise ValueError("data has no %d elements: %s" % (len(view), data))
 
-            if len(data) != number_of_rows:
-                raise ValueError("data has no %d elements: %s" % (number_of_rows, data))
+            column_index = self._column_indexes.get(index)
+            if column_index is not None:
+                # Build the new index first and replace it once instead of moving every entry
+                rows = dict(self._rows)
+                for row_id, value in zip(view, data):
+                    row = list(rows[row_id])
+                    row[index] = value
+                    rows[row_id] = row
+                self._column_indexes[index] = Column_Index(rows, index, column_index.key)
 
-            for i in range(self._number_of_columns):
-                self._data_vars[i][index].set(data[i])
+            rows = self._rows
+            for row_id, value in zip(view, data):
+                rows[row_id][index] = value
+
+            self._update_view(changed_ids=set(view))
 
             if self._on_change_data is not None: self._on_change_data()
 
     def clear(self):
-        number_of_rows = self._number_of_rows
         number_of_columns = self._number_of_columns
 
-        for i in range(number_of_rows):
-            for j in range(number_of_columns):
-                self._data_vars[i][j].set("")
+        rows = {}
+        for row_id in self._rows:
+            rows[row_id] = [""] * number_of_columns
 
-        if self._on_change_data is not None: self._on_change_data()
+        column_indexes = {}
+        for column, column_index in self._column_indexes.items():
+            column_indexes[column] = Column_Index(rows, column, column_index.key)
 
-    def delete_row(self, index):
-        i = index
-        while i < self._number_of_rows:
-            row_of_vars_1 = self._data_vars[i]
-            row_of_vars_2 = self._data_vars[i + 1]
+        self._rows = rows
+        self._column_indexes = column_indexes
 
-            j = 0
-            while j < self._number_of_columns:
-                row_of_vars_1[j].set(row_of_vars_2[j])
+        self._update_view(changed_ids=set(rows))
 
-            i += 1
+        if self._on_change_data is not None: self._on_change_data()
 
-        self._pop_n_rows(1)
+    def delete_row(self, index):
+        position = self._shown_position(index)
+        row_id = self._view.pop(position)
+
+        self._unstore_row(row_id)
+        self._refresh_cells(position)
 
         if self._on_change_data is not None: self._on_change_data()
 
     def insert_row(self, data, index=END):
-        self._append_n_rows(1)
+        """Insert a row before the shown row at index.
+
+        With a sort or filter active the new row takes the place they give it.
+        """
+        self._check_row(data)
 
-        if index == END:
-            index = self._number_of_rows - 1
+        view = self._view
+        if index == END or index >= len(view):
+            position = len(view)
+            order_position = None
+        else:
+            position = self._shown_position(index)
+            order_position = self._order.index(view[position])
 
-        i = self._number_of_rows - 1
-        while i > index:
-            row_of_vars_1 = self._data_vars[i - 1]
-            row_of_vars_2 = self._data_vars[i]
+        row_id = self._store_row(data, order_position)
 
-            j = 0
-            while j < self._number_of_columns:
-                row_of_vars_2[j].set(row_of_vars_1[j])
-                j += 1
-            i -= 1
+        if self._is_shown(row_id):
+            if self._sort_column is not None:
+                position = self._sorted_position(row_id)
 
-        list_of_cell_vars = self._data_vars[index]
-        for cell_var, cell_data in zip(list_of_cell_vars, data):
-            cell_var.set(cell_data)
+            view.insert(position, row_id)
+            self._refresh_cells(position)
 
         if self._on_change_data is not None: self._on_change_data()
 
     def cell(self, row, column, data=None):
         """Get the value of a table cell"""
+        position = self._shown_position(row)
+        row_id = self._view[position]
+        column = self._column_position(column)
+
         if data is None:
-            return self._data_vars[row][column].get()
+            return self._rows[row_id][column]
         else:
-            self._data_vars[row][column].set(data)
+            self._set_stored_cells(row_id, {column: data})
+            self._update_shown_row(position, resort=column == self._sort_column)
             if self._on_change_data is not None: self._on_change_data()
 
     def __getitem__(self, index):
@@ -0,0 +1,214 @@
+import importlib
+import sys
+import types
+import unittest
+
+import tkinter.constants
+
+
+class _Widget(object):
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.grid_cells = {}
+
+    def grid(self, row=0, column=0, **options):
+        self.master.grid_cells[(row, column)] = self
+
+    def grid_slaves(self, row, column):
+        return [self.grid_cells[(row, column)]]
+
+    def grid_columnconfigure(self, index, **options):
+        pass
+
+    def pack(self, **options):
+        pass
+
+    def bind(self, sequence, func):
+        pass
+
+    def configure(self, **options):
+        pass
+
+    def destroy(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_reqwidth(self):
+        return 0
+
+
+class _StringVar(object):
+    number_of_sets = 0
+
+    def __init__(self):
+        self.value = ""
+
+    def set(self, value):
+        _StringVar.number_of_sets += 1
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _import_table():
+    """Import table against a tkinter without Tk, so the tests run without a display"""
+    fake_tkinter = types.ModuleType("tkinter")
+    fake_tkinter.Frame = fake_tkinter.Label = fake_tkinter.Message = _Widget
+    fake_tkinter.StringVar = _StringVar
+    fake_tkinter.constants = tkinter.constants
+
+    real_tkinter = sys.modules["tkinter"]
+    sys.modules["tkinter"] = fake_tkinter
+    sys.modules.pop("table", None)
+    try:
+        return importlib.import_module("table")
+    finally:
+        sys.modules["tkinter"] = real_tkinter
+        sys.modules.pop("table", None)
+
+
+table = _import_table()
+
+
+def make_table(data, **options):
+    t = table.Table(None, ["name", "value"], **options)
+    t.set_data(data)
+    return t
+
+
+def displayed(t):
+    return [[var.get() for var in row_of_vars] for row_of_vars in t._data_vars]
+
+
+class TestSortAndFilter(unittest.TestCase):
+    def setUp(self):
+        self.table = make_table([["a", "3"], ["b", "1"], ["c", ""], ["d", "3"], ["e", "2"]])
+
+    def names(self):
+        return [row[0] for row in self.table.get_data()]
+
+    def test_sort_with_key_puts_rejected_values_last(self):
+        self.table.sort(1, key=float)
+        self.assertEqual(self.names(), ["b", "e", "a", "d", "c"])
+
+        self.table.sort(1, reverse=True, key=float)
+        self.assertEqual(self.names(), ["a", "d", "e", "b", "c"])
+
+        self.table.sort()
+        self.assertEqual(self.names(), ["a", "b", "c", "d", "e"])
+
+    def test_filter(self):
+        self.table.filter(lambda row: row[1] == "3")
+        self.assertEqual(self.names(), ["a", "d"])
+        self.assertEqual(self.table.number_of_rows, 2)
+        self.assertEqual(self.table.number_of_stored_rows, 5)
+        self.assertEqual(displayed(self.table), self.table.get_data())
+
+        self.table.filter()
+        self.assertEqual(self.names(), ["a", "b", "c", "d", "e"])
+
+    def test_insert_and_delete_while_sorted(self):
+        self.table.sort(1, key=float)
+        self.table.insert_row(["f", "1.5"], 0)
+        self.assertEqual(self.names(), ["b", "f", "e", "a", "d", "c"])
+
+        self.table.delete_row(2)
+        self.assertEqual(self.names(), ["b", "f", "a", "d", "c"])
+        self.assertEqual(displayed(self.table), self.table.get_data())
+
+    def test_insert_and_delete_while_filtered(self):
+        self.table.filter(lambda row: row[1] != "3")
+        self.table.insert_row(["f", "4"], 1)
+        self.table.insert_row(["g", "3"], 0)
+        self.assertEqual(self.names(), ["b", "f", "c", "e"])
+        self.assertEqual(self.table.number_of_stored_rows, 7)
+
+        self.table.delete_row(-1)
+        self.assertEqual(self.names(), ["b", "f", "c"])
+
+        self.table.filter()
+        self.assertEqual(self.names(), ["a", "g", "b", "f", "c", "d"])
+
+    def test_delete_row(self):
+        self.table.delete_row(1)
+        self.assertEqual(self.names(), ["a", "c", "d", "e"])
+        self.assertEqual(displayed(self.table), self.table.get_data())
+
+        self.assertRaises(IndexError, self.table.delete_row, 4)
+
+    def test_edits_move_rows(self):
+        self.table.sort(1, key=float)
+
+        self.table[0, 1] = "5"
+        self.assertEqual(self.names(), ["e", "a", "d", "b", "c"])
+
+        self.table.row(4, ["c", "0"])
+        self.assertEqual(self.names(), ["c", "e", "a", "d", "b"])
+
+        self.table[0, 1] = "n/a"
+        self.assertEqual(self.names(), ["e", "a", "d", "b", "c"])
+
+        self.table.column(1, ["5", "4", "3", "2", "1"])
+        self.assertEqual(self.names(), ["c", "b", "d", "a", "e"])
+        self.assertEqual(displayed(self.table), self.table.get_data())
+
+    def test_negative_column_on_sorted_table(self):
+        self.table.sort(1, key=float)
+
+        self.table[0, -1] = "9"
+        self.assertEqual(self.names(), ["e", "a", "d", "b", "c"])
+
+        self.table.column(-1, ["1", "2", "3", "4", "5"])
+        self.assertEqual(self.names(), ["e", "a", "d", "b", "c"])
+
+        self.table.sort(-1, reverse=True, key=float)
+        self.table[0, 1] = "0"
+        self.assertEqual(self.names(), ["b", "d", "a", "e", "c"])
+        self.assertEqual(self.table.sort_column, 1)
+
+        self.assertRaises(IndexError, self.table.cell, 0, 2)
+
+    def test_edit_hides_filtered_row(self):
+        self.table.filter(lambda row: row[1] == "3")
+        self.table[0, 1] = "4"
+        self.assertEqual(self.names(), ["d"])
+        self.assertEqual(self.table.number_of_stored_rows, 5)
+
+    def test_set_data_and_clear_keep_sort(self):
+        self.table.sort(1, key=float)
+
+        self.table.set_data([["x", "2"], ["y", "n/a"], ["z", "1"]])
+        self.assertEqual(self.names(), ["z", "x", "y"])
+
+        self.table.clear()
+        self.assertEqual(self.table.get_data(), [["", ""]] * 3)
+
+
+class TestVisibleRows(unittest.TestCase):
+    def setUp(self):
+        self.table = make_table([[str(i), str(i % 7)] for i in range(1000)], visible_rows=5)
+
+    def test_window(self):
+        self.assertEqual(len(displayed(self.table)), 5)
+
+        self.table.yview(tkinter.constants.MOVETO, 0.5)
+        self.assertEqual(displayed(self.table), self.table.get_data()[500:505])
+        self.assertEqual(self.table.yview(), (0.5, 0.505))
+
+        self.table.yview(tkinter.constants.SCROLL, 1, tkinter.constants.PAGES)
+        self.assertEqual(displayed(self.table), self.table.get_data()[505:510])
+
+    def test_insert_and_delete_touch_only_visible_cells(self):
+        _StringVar.number_of_sets = 0
+        self.table.delete_row(2)
+        self.table.insert_row(["new", "0"], 3)
+        self.table.delete_row(500)
+        self.assertEqual(_StringVar.number_of_sets, 3 * 2 + 2 * 2)
+        self.assertEqual(displayed(self.table), self.table.get_data()[:5])
+
+
+if __name__ == "__main__":
+    unittest.main()